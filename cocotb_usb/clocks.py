@@ -1,32 +1,81 @@
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import Timer, GPITrigger, TriggerException, _wait_callback
+from cocotb.triggers import Timer, GPITrigger, TriggerException
 from cocotb.utils import get_sim_steps, get_time_from_sim_steps
 
 import os
-from random import randint
+from random import choices
 import itertools
 
 if "COCOTB_SIM" in os.environ:
     import simulator
+    # Bound once, it is called on every clock edge
+    _register_timed_callback = simulator.register_timed_callback
+    _deregister_callback = simulator.deregister_callback
 else:
     simulator = None
+    _register_timed_callback = None
+    _deregister_callback = None
+
+# Set USE_HDL_CLKGEN=1 if clocks are driven by the HDL generator
+# (see HDL_CLKGEN_SOURCE) instead of UnstableClock.start
+USE_HDL_CLKGEN = os.environ.get("USE_HDL_CLKGEN", "0") == "1"
+HDL_CLKGEN_SOURCE = os.path.join(os.path.dirname(__file__), "hdl",
+                                 "unstable_clock.v")
 
 
 class UnstableTrigger(GPITrigger):
     """A trigger with uncertainty within defined range."""
+    __slots__ = ('sim_steps', 'delta_neg', 'delta_pos', '_steps')
+
+    # Number of jitter samples drawn from the generator at once
+    JITTER_BATCH = 1024
+
     def __init__(self, time_ps, delta_neg, delta_pos, units=None):
         GPITrigger.__init__(self)
         self.sim_steps = get_sim_steps(time_ps, units)
         self.delta_neg = delta_neg
         self.delta_pos = delta_pos
+        self._steps = iter(())
+
+    def refill(self):
+        """Draw a new batch of jitter samples.
+
+        Samples already include the nominal period, so that taking one
+        is the only work left per period.
+
+        >>> u = UnstableTrigger(100,5,3)
+        >>> u.refill()
+        >>> steps = list(u._steps)
+        >>> len(steps)
+        1024
+        >>> all(95 <= s <= 103 for s in steps)
+        True
+        """
+        # The global generator is used, so the jitter follows the seed
+        # set by cocotb
+        self._steps = iter(choices(range(self.sim_steps - self.delta_neg,
+                                         self.sim_steps + self.delta_pos + 1),
+                                   k=self.JITTER_BATCH))
+
+    def next_steps(self):
+        """Return the duration of the next period, jitter included.
+
+        >>> u = UnstableTrigger(100,5,3)
+        >>> 95 <= u.next_steps() <= 103
+        True
+        """
+        try:
+            return next(self._steps)
+        except StopIteration:
+            self.refill()
+            return next(self._steps)
 
     def prime(self, callback):
         """Register for a timed callback."""
-        steps = self.sim_steps + randint(-self.delta_neg, self.delta_pos)
+        steps = self.next_steps()
         if self.cbhdl is None:
-            self.cbhdl = simulator.register_timed_callback(
-                steps, callback, self)
+            self.cbhdl = _register_timed_callback(steps, callback, self)
             if self.cbhdl is None:
                 raise TriggerException("Unable set up %s Trigger" %
                                        (str(self)))
@@ -56,12 +105,18 @@ class UnstableClock(Clock):
             ``'sec'``.
             When no *units* is given (``None``) the timestep is determined by
             the simulator.
+        hdl (bool, optional): Whether the clock is generated in HDL by the
+            ``unstable_clock`` module (see ``HDL_CLKGEN_SOURCE``) bound to
+            *signal*. In this case :meth:`start` does not drive the signal.
+            Defaults to the ``USE_HDL_CLKGEN`` environment variable.
     """
-    def __init__(self, signal, period, jitter_neg, jitter_pos, units=None):
+    def __init__(self, signal, period, jitter_neg, jitter_pos, units=None,
+                 hdl=None):
         super().__init__(signal, period, units)
         self.jitter_neg = jitter_neg
         self.jitter_pos = jitter_pos
         self.units = units
+        self.hdl = USE_HDL_CLKGEN if hdl is None else hdl
 
     @cocotb.coroutine
     def start(self, cycles=None, start_high=True):
@@ -76,41 +131,93 @@ class UnstableClock(Clock):
             start_high (bool, optional): Whether to start the clock with
                 a ``1`` for the first half of the period.
                 Default is ``True``.
+
+        With jitter, edges are driven from GPI timed callbacks with
+        ``setimmediatevalue`` instead of scheduled ``<=`` writes. The
+        clock therefore changes as soon as the callback runs, before any
+        writes scheduled for the same time step, rather than along with
+        them in the scheduler's write phase. Edges still pending when
+        this coroutine is killed are cancelled.
         """
-        # We need two objects to allow their periods to overlap
-        u1 = UnstableTrigger(self.half_period, self.jitter_neg,
-                             self.jitter_pos, self.units)
-        u2 = UnstableTrigger(self.half_period, self.jitter_neg,
-                             self.jitter_pos, self.units)
+        if self.hdl:
+            # Edges are generated by the simulator, no need to wake up Python
+            return
+
+        if self.jitter_neg == 0 and self.jitter_pos == 0:
+            # Without jitter there is no need for a separate trigger per edge
+            yield super().start(cycles, start_high)
+            return
+
+        u = UnstableTrigger(self.half_period, self.jitter_neg,
+                            self.jitter_pos, self.units)
+        next_steps = u.next_steps
+        signal = self.signal
 
         t = Timer(self.half_period)
 
+        # repeat() does not create a new int on every iteration
         if cycles is None:
-            it = itertools.count()
+            it = itertools.repeat(None)
         else:
-            it = range(cycles)
-
-        def strobeH(ret):
-            self.signal <= 1
+            it = itertools.repeat(None, cycles)
+
+        # Edges are driven straight from GPI callbacks, bypassing
+        # the scheduler. Pending callbacks may overlap, their handles are
+        # kept until they fire so that they can be cancelled.
+        pending = set()
+
+        def strobeH(box):
+            pending.discard(box[0])
+            signal.setimmediatevalue(1)
+
+        def strobeL(box):
+            pending.discard(box[0])
+            signal.setimmediatevalue(0)
+
+        def schedule(strobe):
+            # The handle is only known after registering, the callback
+            # finds it in box
+            box = []
+            hdl = _register_timed_callback(next_steps(), strobe, box)
+            if not hdl:
+                raise TriggerException("Unable set up %s Trigger" % (str(u)))
+            box.append(hdl)
+            pending.add(hdl)
 
-        def strobeL(ret):
-            self.signal <= 0
-
-        # branch outside for loop for performance
         if start_high:
-            self.signal <= 1
-            for _ in it:
-                cocotb.fork(_wait_callback(u1, strobeL))
-                yield t
-                cocotb.fork(_wait_callback(u2, strobeH))
-                yield t
+            signal <= 1
+            first, second = strobeL, strobeH
         else:
-            self.signal <= 0
+            signal <= 0
+            first, second = strobeH, strobeL
+
+        try:
             for _ in it:
-                cocotb.fork(_wait_callback(u1, strobeH))
+                schedule(first)
                 yield t
-                cocotb.fork(_wait_callback(u2, strobeL))
+                schedule(second)
                 yield t
+        except GeneratorExit:
+            # Killed, pending edges would keep toggling the clock
+            for hdl in pending:
+                _deregister_callback(hdl)
+            pending.clear()
+            raise
+
+    @cocotb.coroutine
+    def wait_cycles(self, cycles):
+        """Wait for *cycles* nominal clock periods of simulation time.
+
+        Unlike waiting on ``ClockCycles``, this uses a single timer instead
+        of waking up on every clock edge. It waits for a fixed amount of
+        time, not for clock edges: the jitter drawn for the generated
+        clock is not taken into account, and the wait is not aligned to
+        an edge unless it is started on one.
+
+        Args:
+            cycles (int): Number of clock periods to wait for.
+        """
+        yield Timer(cycles * self.period)
 
     def __str__(self):
         """
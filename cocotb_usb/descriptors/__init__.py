@@ -1,4 +1,7 @@
-from struct import pack
+from functools import lru_cache
+from inspect import signature
+from operator import attrgetter
+from struct import Struct
 
 
 class Descriptor:
@@ -25,15 +28,150 @@ class Descriptor:
         CLASS_SPECIFIC_INTERFACE = 0x24
         CLASS_SPECIFIC_ENDPOINT = 0x25
 
+    # Serialized descriptor fields and their list form returned by get(),
+    # reset whenever a field is assigned
+    __slots__ = ('_packed', '_listed')
+
+    # Set for subclasses defining FORMAT
+    _SIZE = None
+
+    def __new__(cls, *args, **kwargs):
+        self = object.__new__(cls)
+        object.__setattr__(self, "_packed", None)
+        object.__setattr__(self, "_listed", None)
+        return self
+
+    def __init_subclass__(cls, **kwargs):
+        """Compile FORMAT of fixed-size descriptors into ``_STRUCT``.
+
+        ``_SIZE`` holds the packed size, and a default ``bLength`` that
+        disagrees with it is rejected when the class is defined. FIELDS
+        names the attributes packed according to FORMAT, in order.
+
+        >>> class Broken(Descriptor):
+        ...     FORMAT = "<BBH"
+        ...     def __init__(self, bLength=3):
+        ...         self.bLength = bLength
+        Traceback (most recent call last):
+        ...
+        TypeError: Broken: default bLength 3 does not match FORMAT size 4
+        """
+        super().__init_subclass__(**kwargs)
+        fmt = cls.__dict__.get("FORMAT")
+        if fmt is None:
+            return
+        cls._STRUCT = Struct(fmt)
+        cls._SIZE = cls._STRUCT.size
+        fields = cls.__dict__.get("FIELDS")
+        if fields is not None:
+            cls._getFields = attrgetter(*fields)
+        param = signature(cls.__init__).parameters.get("bLength")
+        if param is not None and param.default not in (param.empty, None):
+            if param.default != cls._SIZE:
+                raise TypeError(
+                    "{}: default bLength {} does not match FORMAT size {}"
+                    .format(cls.__name__, param.default, cls._SIZE))
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # Nothing is cached while the descriptor is being constructed, and
+        # get() only caches its list along with the packed contents
+        if self._packed is not None:
+            object.__setattr__(self, "_packed", None)
+            object.__setattr__(self, "_listed", None)
+
+    def _pack(self):
+        """Return FIELDS packed into bytes according to FORMAT.
+
+        Descriptors without FORMAT override this or ``__bytes__``.
+        """
+        return self._STRUCT.pack(*self._getFields(self))
+
+    def __bytes__(self):
+        packed = self._packed
+        if packed is None:
+            packed = self._pack()
+            object.__setattr__(self, "_packed", packed)
+        return packed
+
+    def _pack_into(self, buf):
+        """Append descriptor contents to *buf* bytearray."""
+        packed = self._packed
+        if packed is None:
+            packed = bytes(self)
+        buf += packed
+
+    def __len__(self):
+        """Return size of the descriptor contents.
+
+        Only descriptors without FORMAT have to be packed to get it.
+
+        >>> class Raw(Descriptor):
+        ...     def __bytes__(self):
+        ...         return b"\\x03\\x42\\x00"
+        >>> len(Raw()), bool(Raw())
+        (3, True)
+        >>> Raw().get()
+        [3, 66, 0]
+        >>> e = EndpointDescriptor(7, 0x81, 0x02, 64, 0)
+        >>> i = InterfaceDescriptor(9, 0, 0, 1, 0xFF, 0, 0, 0,
+        ...                         subdescriptors=[Raw(), e])
+        >>> bytes(i)[9:12] == packDescriptors([Raw()]) == bytes(Raw())
+        True
+        """
+        if self._SIZE is None:
+            return len(bytes(self))
+        return self._SIZE
+
     def get(self):
-        """Return descriptor contents as a list of bytes."""
-        return list(bytes(self))
+        """Return descriptor contents as a list of bytes.
+
+        Callers that only index or iterate over the contents should use
+        ``bytes(descriptor)`` instead, which returns the cached contents
+        without building a new list.
+        """
+        packed = bytes(self)
+        if packed is not self._packed:
+            # Contents not fully cached, see overrides of __bytes__
+            return list(packed)
+        listed = self._listed
+        if listed is None:
+            listed = list(packed)
+            object.__setattr__(self, "_listed", listed)
+        # Copy, as callers are free to modify the returned list
+        return listed.copy()
 
 
 class DeviceDescriptor(Descriptor):
-    """Class representing USB device descriptor."""
+    """Class representing USB device descriptor.
+
+    >>> d = DeviceDescriptor(
+    ... bLength=0x0A,
+    ... bcdUSB=0x0100,
+    ... bDeviceClass=0xFF,
+    ... bDeviceSubClass=0x00,
+    ... bDeviceProtocol=0xAB,
+    ... bMaxPacketSize0=64,
+    ... idVendor=0x1234,
+    ... idProduct=0x5678,
+    ... bcdDevice=0x0502,
+    ... iManufacturer=0x01,
+    ... iProduct=0x02,
+    ... iSerialNumber=0x03,
+    ... bNumConfigurations=1)
+    >>> bytes(d)
+    b'\\n\\x01\\x00\\x01\\xff\\x00\\xab@4\\x12xV\\x02\\x05\\x01\\x02\\x03\\x01'
+    """
+    __slots__ = ('bLength', 'bDescriptorType', 'bcdUSB', 'bDeviceClass',
+                 'bDeviceSubClass', 'bDeviceProtocol', 'bMaxPacketSize0',
+                 'idVendor', 'idProduct', 'bcdDevice', 'iManufacturer',
+                 'iProduct', 'iSerialNumber', 'bNumConfigurations')
 
     FORMAT = "<BBH4B3H4B"
+    FIELDS = ('bLength', 'bDescriptorType', 'bcdUSB', 'bDeviceClass',
+              'bDeviceSubClass', 'bDeviceProtocol', 'bMaxPacketSize0',
+              'idVendor', 'idProduct', 'bcdDevice', 'iManufacturer',
+              'iProduct', 'iSerialNumber', 'bNumConfigurations')
 
     def __init__(self,
                  bLength,
@@ -65,46 +203,27 @@ class DeviceDescriptor(Descriptor):
         self.iSerialNumber = iSerialNumber
         self.bNumConfigurations = bNumConfigurations
 
-    def __bytes__(self):
-        """
-        >>> d = DeviceDescriptor(
-        ... bLength=0x0A,
-        ... bcdUSB=0x0100,
-        ... bDeviceClass=0xFF,
-        ... bDeviceSubClass=0x00,
-        ... bDeviceProtocol=0xAB,
-        ... bMaxPacketSize0=64,
-        ... idVendor=0x1234,
-        ... idProduct=0x5678,
-        ... bcdDevice=0x0502,
-        ... iManufacturer=0x01,
-        ... iProduct=0x02,
-        ... iSerialNumber=0x03,
-        ... bNumConfigurations=1)
-        >>> bytes(d)
-        b'\\n\\x01\\x00\\x01\\xff\\x00\\xab@4\\x12xV\\x02\\x05\\x01\\x02\\x03\\x01'
-        """
-        return pack(self.FORMAT,
-                    self.bLength,
-                    self.bDescriptorType,
-                    self.bcdUSB,
-                    self.bDeviceClass,
-                    self.bDeviceSubClass,
-                    self.bDeviceProtocol,
-                    self.bMaxPacketSize0,
-                    self.idVendor,
-                    self.idProduct,
-                    self.bcdDevice,
-                    self.iManufacturer,
-                    self.iProduct,
-                    self.iSerialNumber,
-                    self.bNumConfigurations)
-
 
 class EndpointDescriptor(Descriptor):
-    """Class representing standard USB endpoint descriptor."""
+    """Class representing standard USB endpoint descriptor.
+
+    >>> e = EndpointDescriptor(
+    ... bLength=7,
+    ... bEndpointAddress=0x82,
+    ... bmAttributes=0x01,
+    ... wMaxPacketSize=0x0100,
+    ... bInterval=0x01)
+    >>> bytes(e)
+    b'\\x07\\x05\\x82\\x01\\x00\\x01\\x01'
+    >>> e.get()
+    [7, 5, 130, 1, 0, 1, 1]
+    """
+    __slots__ = ('bLength', 'bDescriptorType', 'bEndpointAddress',
+                 'bmAttributes', 'wMaxPacketSize', 'bInterval')
 
     FORMAT = "<4BHB"
+    FIELDS = ('bLength', 'bDescriptorType', 'bEndpointAddress', 'bmAttributes',
+              'wMaxPacketSize', 'bInterval')
 
     class Direction:
         OUT = 0
@@ -142,32 +261,18 @@ class EndpointDescriptor(Descriptor):
         self.bInterval = bInterval
         self.bDescriptorType = bDescriptorType
 
-    def __bytes__(self):
-        """
-        >>> e = EndpointDescriptor(
-        ... bLength=7,
-        ... bEndpointAddress=0x82,
-        ... bmAttributes=0x01,
-        ... wMaxPacketSize=0x0100,
-        ... bInterval=0x01)
-        >>> bytes(e)
-        b'\\x07\\x05\\x82\\x01\\x00\\x01\\x01'
-        >>> e.get()
-        [7, 5, 130, 1, 0, 1, 1]
-        """
-        return pack(self.FORMAT,
-                    self.bLength,
-                    self.bDescriptorType,
-                    self.bEndpointAddress,
-                    self.bmAttributes,
-                    self.wMaxPacketSize,
-                    self.bInterval)
-
 
 class InterfaceDescriptor(Descriptor):
     """Class representing standard USB interface descriptor."""
+    __slots__ = ('bLength', 'bDescriptorType', 'bInterfaceNumber',
+                 'bAlternateSetting', 'bNumEndpoints', 'bInterfaceClass',
+                 'bInterfaceSubclass', 'bInterfaceProtocol', 'iInterface',
+                 'subdescriptors')
 
     FORMAT = "<BB7B"
+    FIELDS = ('bLength', 'bDescriptorType', 'bInterfaceNumber',
+              'bAlternateSetting', 'bNumEndpoints', 'bInterfaceClass',
+              'bInterfaceSubclass', 'bInterfaceProtocol', 'iInterface')
 
     def __init__(self,
                  bLength,
@@ -179,7 +284,7 @@ class InterfaceDescriptor(Descriptor):
                  bInterfaceProtocol,
                  iInterface,
                  bDescriptorType=Descriptor.Types.INTERFACE,
-                 subdescriptors=[]):
+                 subdescriptors=None):
         self.bLength = bLength
         self.bInterfaceNumber = bInterfaceNumber
         self.bAlternateSetting = bAlternateSetting
@@ -189,6 +294,8 @@ class InterfaceDescriptor(Descriptor):
         self.bInterfaceProtocol = bInterfaceProtocol
         self.iInterface = iInterface
         self.bDescriptorType = bDescriptorType
+        if subdescriptors is None:
+            subdescriptors = []
         self.subdescriptors = subdescriptors
 
     def __bytes__(self):
@@ -218,19 +325,34 @@ class InterfaceDescriptor(Descriptor):
         b'\\t\\x04\\x00\\x00\\x00\\xff\\x01\\xff\\x00\\x07\\x05\\x82\\x01\\x00\\x01\\x01'
         >>> i.get()
         [9, 4, 0, 0, 0, 255, 1, 255, 0, 7, 5, 130, 1, 0, 1, 1]
+
+        Descriptors created without subdescriptors don't share a list:
+
+        >>> i1 = InterfaceDescriptor(9, 1, 0, 0, 0xFF, 0x01, 0xFF, 0)
+        >>> i1.subdescriptors.append(e)
+        >>> InterfaceDescriptor(9, 2, 0, 0, 0xFF, 0x01, 0xFF, 0).get()
+        [9, 4, 2, 0, 0, 255, 1, 255, 0]
+        """
+        buf = bytearray()
+        self._pack_into(buf)
+        return bytes(buf)
+
+    def __len__(self):
+        """
+        >>> e = EndpointDescriptor(7, 0x81, 0x02, 64, 0)
+        >>> i = InterfaceDescriptor(9, 0, 0, 1, 0xFF, 0, 0, 0,
+        ...                         subdescriptors=[e])
+        >>> len(i) == len(bytes(i)) == 16
+        True
         """
-        desc = pack(self.FORMAT,
-                    self.bLength,
-                    self.bDescriptorType,
-                    self.bInterfaceNumber,
-                    self.bAlternateSetting,
-                    self.bNumEndpoints,
-                    self.bInterfaceClass,
-                    self.bInterfaceSubclass,
-                    self.bInterfaceProtocol,
-                    self.iInterface)
-        subdesc = b''.join([bytes(e) for e in self.subdescriptors])
-        return b''.join([desc, subdesc])
+        return self._SIZE + sum(len(e) for e in self.subdescriptors)
+
+    def _pack_into(self, buf):
+        # Subdescriptors cache their own contents and the list may be
+        # modified in place, so only the header is cached here
+        buf += Descriptor.__bytes__(self)
+        for e in self.subdescriptors:
+            e._pack_into(buf)
 
 
 class ConfigDescriptor(Descriptor):
@@ -239,8 +361,14 @@ class ConfigDescriptor(Descriptor):
     Can also represent OTHER_SPEED_CONFIGURATION descriptor, as they have
     identical contents.
     """
+    __slots__ = ('bLength', 'bDescriptorType', 'wTotalLength',
+                 'bNumInterfaces', 'bConfigurationValue', 'iConfiguration',
+                 'bmAttributes', 'bMaxPower', 'interfaces')
 
     FORMAT = "<BBH5B"
+    FIELDS = ('bLength', 'bDescriptorType', 'wTotalLength', 'bNumInterfaces',
+              'bConfigurationValue', 'iConfiguration', 'bmAttributes',
+              'bMaxPower')
 
     class Attributes():
         NONE = 0
@@ -258,7 +386,7 @@ class ConfigDescriptor(Descriptor):
                  bmAttributes,
                  bMaxPower,
                  bDescriptorType=Descriptor.Types.CONFIGURATION,
-                 interfaces=[]):
+                 interfaces=None):
         self.bLength = bLength
         self.wTotalLength = wTotalLength
         self.bNumInterfaces = bNumInterfaces
@@ -267,6 +395,8 @@ class ConfigDescriptor(Descriptor):
         self.bmAttributes = bmAttributes
         self.bMaxPower = bMaxPower
         self.bDescriptorType = bDescriptorType
+        if interfaces is None:
+            interfaces = []
         self.interfaces = interfaces
 
     def __bytes__(self):
@@ -305,18 +435,44 @@ class ConfigDescriptor(Descriptor):
         b'\\t\\x02S\\x00\\x01\\x01\\x00@\\x00\\t\\x04\\x00\\x00\\x00\\xff\\x01\\xff\\x00\\x07\\x05\\x82\\x01\\x00\\x01\\x01'
         >>> c.get()
         [9, 2, 83, 0, 1, 1, 0, 64, 0, 9, 4, 0, 0, 0, 255, 1, 255, 0, 7, 5, 130, 1, 0, 1, 1]
+
+        >>> c1 = ConfigDescriptor(9, 0x12, 1, 1, 0, 0x40, 0)
+        >>> c1.interfaces.append(i)
+        >>> ConfigDescriptor(9, 0x09, 1, 2, 0, 0x40, 0).get()
+        [9, 2, 9, 0, 1, 2, 0, 64, 0]
         """ # noqa
-        desc = pack(self.FORMAT,
-                    self.bLength,
-                    self.bDescriptorType,
-                    self.wTotalLength,
-                    self.bNumInterfaces,
-                    self.bConfigurationValue,
-                    self.iConfiguration,
-                    self.bmAttributes,
-                    self.bMaxPower)
-        subdesc = b''.join([bytes(i) for i in self.interfaces])
-        return b''.join([desc, subdesc])
+        buf = bytearray()
+        self._pack_into(buf)
+        return bytes(buf)
+
+    def __len__(self):
+        """Return wTotalLength the descriptor tree would need.
+
+        >>> e = EndpointDescriptor(7, 0x81, 0x02, 64, 0)
+        >>> i = InterfaceDescriptor(9, 0, 0, 1, 0xFF, 0, 0, 0,
+        ...                         subdescriptors=[e])
+        >>> c = ConfigDescriptor(9, 0, 1, 1, 0, 0x80, 50, interfaces=[i])
+        >>> len(c) == len(bytes(c)) == 25
+        True
+        """
+        return self._SIZE + sum(len(i) for i in self.interfaces)
+
+    def _pack_into(self, buf):
+        # Only the header is cached, see InterfaceDescriptor._pack_into
+        buf += Descriptor.__bytes__(self)
+        for i in self.interfaces:
+            i._pack_into(buf)
+
+
+@lru_cache(maxsize=32)
+def _packLangIds(bLength, bDescriptorType, ids):
+    """Return string descriptor zero packed from a tuple of LangIds.
+
+    Devices almost always share a handful of LangId tables, so the packed
+    bytes are reused between descriptors with the same contents.
+    """
+    return Struct("<BB{}H".format(len(ids))).pack(bLength, bDescriptorType,
+                                                  *ids)
 
 
 class StringDescriptorZero(Descriptor):
@@ -325,6 +481,8 @@ class StringDescriptorZero(Descriptor):
      This one is different than other string descriptors in that it contains
      an array of supported LanguageIds instead of an actual string.
     """
+    __slots__ = ('bLength', 'bDescriptorType', '_wLangId')
+
     def __init__(self,
                  wLangIdList,
                  bLength=None,
@@ -336,7 +494,20 @@ class StringDescriptorZero(Descriptor):
             self.bLength = bLength
         self.bDescriptorType = bDescriptorType
 
-    def __bytes__(self):
+    @property
+    def wLangId(self):
+        return self._wLangId
+
+    @wLangId.setter
+    def wLangId(self, value):
+        # Kept as a tuple, so the cached contents can only change along
+        # with an assignment, which invalidates them
+        self._wLangId = tuple(value)
+
+    def __len__(self):
+        return 2 + 2 * len(self.wLangId)
+
+    def _pack(self):
         """
         >>> s0 = StringDescriptorZero(wLangIdList=[0x0409])
         >>> bytes(s0)
@@ -349,44 +520,70 @@ class StringDescriptorZero(Descriptor):
         b'\\n\\x03\\t\\x04\\x04\\x089\\x04\\n\\x04'
         >>> s0.get()
         [10, 3, 9, 4, 4, 8, 57, 4, 10, 4]
+
+        >>> s0.wLangId = [0x0409, 0x0407, 0x0439, 0x040a]
+        >>> s0.get()
+        [10, 3, 9, 4, 7, 4, 57, 4, 10, 4]
+        >>> s0.wLangId
+        (1033, 1031, 1081, 1034)
         """ # noqa
-        desc = pack("<BB{}H".format(len(self.wLangId)),
-                    self.bLength,
-                    self.bDescriptorType,
-                    *self.wLangId)
-        return desc
+        return _packLangIds(self.bLength, self.bDescriptorType,
+                            self.wLangId)
 
 
 class StringDescriptor(Descriptor):
     """Class representing standard USB string descriptor."""
+    __slots__ = ('bLength', 'bDescriptorType', '_bString', '_encoded')
+
+    _HEADER_STRUCT = Struct("<BB")
+
     def __init__(self,
                  bString,
                  bLength=None,
                  bDescriptorType=Descriptor.Types.STRING):
         self.bString = bString
         if bLength is None:
-            self.bLength = 2 + 2*len(bString)
+            self.bLength = 2 + len(self._encoded)
         else:
             self.bLength = bLength
         self.bDescriptorType = bDescriptorType
 
-    def __bytes__(self):
+    @property
+    def bString(self):
+        return self._bString
+
+    @bString.setter
+    def bString(self, value):
+        self._bString = value
+        self._encoded = value.encode("utf-16-le")
+
+    def __len__(self):
+        return 2 + len(self._encoded)
+
+    def _pack(self):
         """
         >>> s1 = StringDescriptor("Product name")
         >>> bytes(s1)
         b'\\x1a\\x03P\\x00r\\x00o\\x00d\\x00u\\x00c\\x00t\\x00 \\x00n\\x00a\\x00m\\x00e\\x00'
         >>> s1.get()
         [26, 3, 80, 0, 114, 0, 111, 0, 100, 0, 117, 0, 99, 0, 116, 0, 32, 0, 110, 0, 97, 0, 109, 0, 101, 0]
+
+        Characters outside the BMP take two UTF-16 code units:
+
+        >>> s2 = StringDescriptor("\\U0001F50C")
+        >>> s2.get()
+        [6, 3, 61, 216, 12, 221]
         """ # noqa
-        header = pack("<BB",
-                      self.bLength,
-                      self.bDescriptorType)
-        desc = header + self.bString.encode("utf-16-le")
-        return desc
+        header = self._HEADER_STRUCT.pack(self.bLength,
+                                          self.bDescriptorType)
+        return header + self._encoded
 
 
 class DeviceQualifierDescriptor(Descriptor):
     """Class representing standard USB device qualifier descriptor."""
+    __slots__ = ('bLength', 'bDescriptorType', 'bcdUSB', 'bDeviceClass',
+                 'bDeviceSubClass', 'bDeviceProtocol', 'bMaxPacketSize0',
+                 'bNumConfigurations')
 
     FORMAT = "<BBH6B"
 
@@ -408,7 +605,7 @@ class DeviceQualifierDescriptor(Descriptor):
         self.bLength = bLength
         self.bDescriptorType = bDescriptorType
 
-    def __bytes__(self):
+    def _pack(self):
         """
         >>> d = DeviceQualifierDescriptor(
         ... bcdUSB=0x0100,
@@ -422,16 +619,34 @@ class DeviceQualifierDescriptor(Descriptor):
         >>> d.get()
         [10, 6, 0, 1, 255, 0, 238, 64, 1, 0]
         """
-        return pack(self.FORMAT,
-                    self.bLength,
-                    self.bDescriptorType,
-                    self.bcdUSB,
-                    self.bDeviceClass,
-                    self.bDeviceSubClass,
-                    self.bDeviceProtocol,
-                    self.bMaxPacketSize0,
-                    self.bNumConfigurations,
-                    0x00)  # Reserved for future use
+        return self._STRUCT.pack(self.bLength,
+                                 self.bDescriptorType,
+                                 self.bcdUSB,
+                                 self.bDeviceClass,
+                                 self.bDeviceSubClass,
+                                 self.bDeviceProtocol,
+                                 self.bMaxPacketSize0,
+                                 self.bNumConfigurations,
+                                 0x00)  # Reserved for future use
+
+
+def packDescriptors(descriptors):
+    """Return contents of consecutive descriptors as a single bytes object.
+
+    Each descriptor is written into one shared buffer, without building
+    intermediate bytes for descriptor trees.
+
+    .. doctest::
+
+        >>> e1 = EndpointDescriptor(7, 0x81, 0x02, 64, 0)
+        >>> e2 = EndpointDescriptor(7, 0x02, 0x02, 64, 0)
+        >>> packDescriptors([e1, e2]) == bytes(e1) + bytes(e2)
+        True
+    """
+    buf = bytearray()
+    for d in descriptors:
+        d._pack_into(buf)
+    return bytes(buf)
 
 
 class FeatureSelector:
@@ -451,8 +666,11 @@ class FeatureSelector:
 
 class USBDeviceRequest():
     """Class grouping common USB request definitions."""
+    __slots__ = ('bmRequestType', 'bRequest', 'wValue', 'wIndex',
+                 'wLength')
 
     FORMAT = "<BB3H"
+    _STRUCT = Struct(FORMAT)
 
     class Type():
         # Format constants from USB Spec 9.3
@@ -498,29 +716,47 @@ class USBDeviceRequest():
         self.wIndex = wIndex
         self.wLength = wLength
 
+    @staticmethod
     def build(bmRequestType, bRequest, wValue, wIndex, wLength):
         """Create a USB request with provided values.
 
+        Returns:
+            bytes: Setup packet contents. Convert with ``list()`` before
+            comparing with a list of received bytes, as ``bytes`` never
+            compares equal to a list.
+
         .. doctest::
 
-            >>> USBDeviceRequest.build(
+            >>> list(USBDeviceRequest.build(
             ... bmRequestType=0x00,
             ... bRequest=0x05,
             ... wValue=0x02,
             ... wIndex=0x00,
-            ... wLength=0x00)
+            ... wLength=0x00))
             [0, 5, 2, 0, 0, 0, 0, 0]
         """
-        return [
-            bmRequestType,
-            bRequest,
-            wValue & 0x00FF,
-            wValue >> 8,
-            wIndex & 0x00FF,
-            wIndex >> 8,
-            wLength & 0x00FF,
-            wLength >> 8,
-        ]
+        return USBDeviceRequest._STRUCT.pack(bmRequestType, bRequest,
+                                             wValue, wIndex, wLength)
+
+    @staticmethod
+    def builder(bmRequestType, bRequest):
+        """Return a function creating USB requests of a fixed type.
+
+        The returned function takes ``wValue``, ``wIndex`` and ``wLength``
+        and is equivalent to :meth:`build` with the given
+        *bmRequestType* and *bRequest*.
+
+        .. doctest::
+
+            >>> set_address = USBDeviceRequest.builder(0x00, 0x05)
+            >>> list(set_address(0x02, 0x00, 0x00))
+            [0, 5, 2, 0, 0, 0, 0, 0]
+        """
+        pack = USBDeviceRequest._STRUCT.pack
+
+        def build(wValue, wIndex, wLength):
+            return pack(bmRequestType, bRequest, wValue, wIndex, wLength)
+        return build
 
     def __bytes__(self):
         """
@@ -533,12 +769,26 @@ class USBDeviceRequest():
         >>> bytes(r)
         b'\\x00\\x05\\x02\\x00\\x00\\x00\\x00\\x00'
         """
-        return pack(self.FORMAT,
-                    self.bmRequestType,
-                    self.bRequest,
-                    self.wValue,
-                    self.wIndex,
-                    self.wLength)
+        return self._STRUCT.pack(self.bmRequestType,
+                                 self.bRequest,
+                                 self.wValue,
+                                 self.wIndex,
+                                 self.wLength)
+
+
+# Builders of standard requests with fixed type and code
+_setAddress = USBDeviceRequest.builder(
+    USBDeviceRequest.Type.HOST_TO_DEVICE | USBDeviceRequest.Type.STANDARD
+    | USBDeviceRequest.Type.DEVICE,
+    USBDeviceRequest.Code.SET_ADDRESS)
+_getDescriptor = USBDeviceRequest.builder(
+    USBDeviceRequest.Type.DEVICE_TO_HOST | USBDeviceRequest.Type.STANDARD
+    | USBDeviceRequest.Type.DEVICE,
+    USBDeviceRequest.Code.GET_DESCRIPTOR)
+_setConfiguration = USBDeviceRequest.builder(
+    USBDeviceRequest.Type.HOST_TO_DEVICE | USBDeviceRequest.Type.STANDARD
+    | USBDeviceRequest.Type.DEVICE,
+    USBDeviceRequest.Code.SET_CONFIGURATION)
 
 
 def setAddressRequest(address):
@@ -549,17 +799,11 @@ def setAddressRequest(address):
 
     .. doctest::
 
-        >>> setAddressRequest(0x30)
+        >>> list(setAddressRequest(0x30))
         [0, 5, 48, 0, 0, 0, 0, 0]
     """
     assert address <= 127
-    return USBDeviceRequest.build(USBDeviceRequest.Type.HOST_TO_DEVICE
-                                  | USBDeviceRequest.Type.STANDARD
-                                  | USBDeviceRequest.Type.DEVICE,
-                                  bRequest=USBDeviceRequest.Code.SET_ADDRESS,
-                                  wValue=address,
-                                  wIndex=0,
-                                  wLength=0)
+    return _setAddress(address, 0, 0)
 
 
 def getDescriptorRequest(descriptor_type, descriptor_index, lang_id, length):
@@ -574,21 +818,16 @@ def getDescriptorRequest(descriptor_type, descriptor_index, lang_id, length):
 
     .. doctest::
 
-        >>> getDescriptorRequest(
+        >>> list(getDescriptorRequest(
         ... descriptor_type=2,
         ... descriptor_index=1,
         ... lang_id=0,
         ... length=9
-        ... )
+        ... ))
         [128, 6, 1, 2, 0, 0, 9, 0]
     """
-    return USBDeviceRequest.build(
-        USBDeviceRequest.Type.DEVICE_TO_HOST | USBDeviceRequest.Type.STANDARD
-        | USBDeviceRequest.Type.DEVICE,
-        bRequest=USBDeviceRequest.Code.GET_DESCRIPTOR,
-        wValue=descriptor_type << 8 | descriptor_index,
-        wIndex=lang_id,
-        wLength=length)
+    return _getDescriptor(descriptor_type << 8 | descriptor_index, lang_id,
+                          length)
 
 
 def setConfigurationRequest(configuration):
@@ -600,18 +839,12 @@ def setConfigurationRequest(configuration):
 
     .. doctest::
 
-         >>> setConfigurationRequest(3)
+         >>> list(setConfigurationRequest(3))
          [0, 9, 3, 0, 0, 0, 0, 0]
     """
     # Upper byte of wValue byte is reserved here
     assert configuration <= 255
-    return USBDeviceRequest.build(
-        USBDeviceRequest.Type.HOST_TO_DEVICE | USBDeviceRequest.Type.STANDARD
-        | USBDeviceRequest.Type.DEVICE,
-        bRequest=USBDeviceRequest.Code.SET_CONFIGURATION,
-        wValue=configuration,
-        wIndex=0,
-        wLength=0)
+    return _setConfiguration(configuration, 0, 0)
 
 
 def setFeatureRequest(feature_selector, recipient, target=0, test_selector=0):
@@ -627,16 +860,29 @@ def setFeatureRequest(feature_selector, recipient, target=0, test_selector=0):
 
     .. doctest::
 
-        >>> setFeatureRequest(
+        >>> list(setFeatureRequest(
         ... feature_selector=0,
-        ... recipient=0)
+        ... recipient=0))
         [0, 3, 0, 0, 0, 0, 0, 0]
+
+        >>> list(setFeatureRequest(
+        ... feature_selector=FeatureSelector.ENDPOINT_HALT,
+        ... recipient=2,
+        ... target=0x81))
+        [2, 3, 0, 0, 129, 0, 0, 0]
+
+        >>> list(setFeatureRequest(
+        ... feature_selector=FeatureSelector.TEST_MODE,
+        ... recipient=0,
+        ... test_selector=FeatureSelector.TestMode.TEST_PACKET))
+        [0, 3, 2, 0, 0, 4, 0, 0]
     """
+    # Test selector goes to the upper byte of wIndex, wValue holds
+    # the feature selector only
     return USBDeviceRequest.build(USBDeviceRequest.Type.HOST_TO_DEVICE
                                   | USBDeviceRequest.Type.STANDARD | recipient,
                                   bRequest=USBDeviceRequest.Code.SET_FEATURE,
-                                  wValue=feature_selector << 8
-                                  | feature_selector,
+                                  wValue=feature_selector,
                                   wIndex=test_selector << 8 | target,
                                   wLength=0)
 
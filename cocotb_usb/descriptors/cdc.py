@@ -20,10 +20,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import logging
 import struct
+from functools import lru_cache
 
 from cocotb_usb.descriptors import Descriptor, USBDeviceRequest
-from cocotb_usb.utils import getVal
+from cocotb_usb.utils import getByte, getWord
 
 """
 CDC specific descriptors
@@ -35,9 +37,12 @@ This PDF is a good reference:
 * Author(s): Scott Shawcroft
 """
 
+_log = logging.getLogger(__name__)
+
 
 class CDC(Descriptor):
     """Base class for storing common CDC definitions."""
+    __slots__ = ()
 
     class Type:
         DEVICE = 0x02
@@ -83,8 +88,18 @@ class CDC(Descriptor):
 
 
 class Header(CDC):
-    """Descriptor representing start of CDC class-specific section."""
+    """Descriptor representing start of CDC class-specific section.
+
+    >>> h = Header(bcdCDC=0x0110)
+    >>> bytes(h)
+    b'\\x05$\\x00\\x10\\x01'
+    >>> h.get()
+    [5, 36, 0, 16, 1]
+    """
+    __slots__ = ('bLength', 'bDescriptorType', 'bDescriptorSubtype', 'bcdCDC')
+
     FORMAT = "<BBB" + "H"
+    FIELDS = ('bLength', 'bDescriptorType', 'bDescriptorSubtype', 'bcdCDC')
 
     def __init__(self,
                  bcdCDC,
@@ -100,26 +115,25 @@ class Header(CDC):
     def notes(self):
         return [str(self)]
 
-    def __bytes__(self):
-        """
-        >>> h = Header(bcdCDC=0x0110)
-        >>> bytes(h)
-        b'\\x05$\\x00\\x10\\x01'
-        >>> h.get()
-        [5, 36, 0, 16, 1]
-        """
-        return struct.pack(self.FORMAT,
-                           self.bLength,
-                           self.bDescriptorType,
-                           self.bDescriptorSubtype,
-                           self.bcdCDC)
-
 
 class CallManagement(CDC):
     """Describes call processing for the Communication interface.
     See section 5.2.3.2  of CDC specification for details.
+
+    >>> cm = CallManagement(
+    ... bmCapabilities=0,
+    ... bDataInterface=1)
+    >>> bytes(cm)
+    b'\\x05$\\x01\\x00\\x01'
+    >>> cm.get()
+    [5, 36, 1, 0, 1]
     """
+    __slots__ = ('bLength', 'bDescriptorType', 'bDescriptorSubtype',
+                 'bmCapabilities', 'bDataInterface')
+
     FORMAT = "<BBB" + "BB"
+    FIELDS = ('bLength', 'bDescriptorType', 'bDescriptorSubtype',
+              'bmCapabilities', 'bDataInterface')
 
     def __init__(self,
                  bmCapabilities,
@@ -137,29 +151,23 @@ class CallManagement(CDC):
     def notes(self):
         return [str(self)]
 
-    def __bytes__(self):
-        """
-        >>> cm = CallManagement(
-        ... bmCapabilities=0,
-        ... bDataInterface=1)
-        >>> bytes(cm)
-        b'\\x05$\\x01\\x00\\x01'
-        >>> cm.get()
-        [5, 36, 1, 0, 1]
-        """
-        return struct.pack(self.FORMAT,
-                           self.bLength,
-                           self.bDescriptorType,
-                           self.bDescriptorSubtype,
-                           self.bmCapabilities,
-                           self.bDataInterface)
-
 
 class AbstractControlManagement(CDC):
     """Describes commands supported by the ACM subclass.
     See section 5.2.3.3  of CDC specification for details.
+
+    >>> acm = AbstractControlManagement(bmCapabilities=6)
+    >>> bytes(acm)
+    b'\\x04$\\x02\\x06'
+    >>> acm.get()
+    [4, 36, 2, 6]
     """
+    __slots__ = ('bLength', 'bDescriptorType', 'bDescriptorSubtype',
+                 'bmCapabilities')
+
     FORMAT = "<BBB" + "B"
+    FIELDS = ('bLength', 'bDescriptorType', 'bDescriptorSubtype',
+              'bmCapabilities')
 
     def __init__(self,
                  bmCapabilities,
@@ -175,26 +183,23 @@ class AbstractControlManagement(CDC):
     def notes(self):
         return [str(self)]
 
-    def __bytes__(self):
-        """
-        >>> acm = AbstractControlManagement(bmCapabilities=6)
-        >>> bytes(acm)
-        b'\\x04$\\x02\\x06'
-        >>> acm.get()
-        [4, 36, 2, 6]
-        """
-        return struct.pack(self.FORMAT,
-                           self.bLength,
-                           self.bDescriptorType,
-                           self.bDescriptorSubtype,
-                           self.bmCapabilities)
-
 
 class DirectLineManagement(CDC):
     """Describes commands supported by the DLCM subclass.
     See section 5.2.3.4  of CDC specification for details.
+
+    >>> dlm = DirectLineManagement(bmCapabilities=1)
+    >>> bytes(dlm)
+    b'\\x04$\\x03\\x01'
+    >>> dlm.get()
+    [4, 36, 3, 1]
     """
+    __slots__ = ('bLength', 'bDescriptorType', 'bDescriptorSubtype',
+                 'bmCapabilities')
+
     FORMAT = "<BBB" + "B"
+    FIELDS = ('bLength', 'bDescriptorType', 'bDescriptorSubtype',
+              'bmCapabilities')
 
     def __init__(self,
                  bmCapabilities,
@@ -210,26 +215,15 @@ class DirectLineManagement(CDC):
     def notes(self):
         return [str(self)]
 
-    def __bytes__(self):
-        """
-        >>> dlm = DirectLineManagement(bmCapabilities=1)
-        >>> bytes(dlm)
-        b'\\x04$\\x03\\x01'
-        >>> dlm.get()
-        [4, 36, 3, 1]
-        """
-        return struct.pack(self.FORMAT,
-                           self.bLength,
-                           self.bDescriptorType,
-                           self.bDescriptorSubtype,
-                           self.bmCapabilities)
-
 
 class Union(CDC):
     """This descriptor enables grouping interfaces that can be treated as
     a functional unit.
     See section 5.2.3.8  of CDC specification for details.
     """
+    __slots__ = ('bDescriptorType', 'bDescriptorSubtype', 'bMasterInterface',
+                 '_bSlaveInterface_list')
+
     FIXED_FORMAT = "<BBB" + "B"     # not including bSlaveInterface_list
     FIXED_BLENGTH = struct.calcsize(FIXED_FORMAT)
 
@@ -249,10 +243,23 @@ class Union(CDC):
         # bSlaveInterface_list is a list of one or more slave interfaces.
         self.bSlaveInterface_list = bSlaveInterface_list
 
+    @property
+    def bSlaveInterface_list(self):
+        return self._bSlaveInterface_list
+
+    @bSlaveInterface_list.setter
+    def bSlaveInterface_list(self, value):
+        # Kept as a tuple, so the cached contents can only change along
+        # with an assignment, which invalidates them
+        self._bSlaveInterface_list = tuple(value)
+
+    def __len__(self):
+        return self.bLength
+
     def notes(self):
         return [str(self)]
 
-    def __bytes__(self):
+    def _pack(self):
         """
         >>> u = Union(
         ... bMasterInterface=0,
@@ -261,13 +268,24 @@ class Union(CDC):
         b'\\x05$\\x06\\x00\\x01'
         >>> u.get()
         [5, 36, 6, 0, 1]
+
+        >>> u.bSlaveInterface_list = [1, 2]
+        >>> u.get()
+        [6, 36, 6, 0, 1, 2]
         """
-        desc = struct.pack(self.FIXED_FORMAT,
-                           self.bLength,
-                           self.bDescriptorType,
-                           self.bDescriptorSubtype,
-                           self.bMasterInterface)
-        return desc + bytes(self.bSlaveInterface_list)
+        slaves = bytes(self.bSlaveInterface_list)
+        count = len(slaves)
+        return _union_struct(count).pack(self.FIXED_BLENGTH + count,
+                                         self.bDescriptorType,
+                                         self.bDescriptorSubtype,
+                                         self.bMasterInterface,
+                                         slaves)
+
+
+@lru_cache(maxsize=None)
+def _union_struct(count):
+    """Return a Struct for Union descriptor with *count* slave interfaces."""
+    return struct.Struct(Union.FIXED_FORMAT + "{}s".format(count))
 
 
 def parseCDC(field):
@@ -325,53 +343,100 @@ def parseCDC(field):
         >>> u = parseCDC(f)
         >>> u.get()
         [5, 36, 6, 0, 1]
+
+        >>> f["bSlaveInterface"] = [1, "0x02"]
+        >>> parseCDC(f).get()
+        [6, 36, 6, 0, 1, 2]
+        >>> f["bSlaveInterface"] = [0x100]
+        >>> parseCDC(f)
+        Traceback (most recent call last):
+        ...
+        ValueError: bytes must be in range(0, 256)
+        >>> f["bSlaveInterface"] = 3
+        >>> parseCDC(f)
+        Traceback (most recent call last):
+        ...
+        TypeError: 'int' object is not iterable
+
+        Unsupported subtypes are logged and skipped:
+
+        >>> parseCDC({"bDescriptorSubtype": "0x11"}) is None
+        True
     """
-    bDescriptorSubtype = getVal(field["bDescriptorSubtype"], 0, 0xFF)
-    if bDescriptorSubtype == CDC.Subtype.HEADER:
-        return Header(
-                 bLength=getVal(field["bLength"], 0, 0xFF),
-                 bDescriptorType=getVal(field["bDescriptorType"], 0, 0xFF),
-                 bDescriptorSubtype=getVal(field["bDescriptorSubtype"],
-                                           0, 0xFF),
-                 bcdCDC=getVal(field["bcdCDC"], 0, 0xFFFF)
-                 )
-    elif bDescriptorSubtype == CDC.Subtype.CM:
-        return CallManagement(
-                 bLength=getVal(field["bLength"], 0, 0xFF),
-                 bDescriptorType=getVal(field["bDescriptorType"], 0, 0xFF),
-                 bDescriptorSubtype=getVal(field["bDescriptorSubtype"],
-                                           0, 0xFF),
-                 bmCapabilities=getVal(field["bmCapabilities"], 0, 0xFF),
-                 bDataInterface=getVal(field["bDataInterface"], 0, 0xFF)
-                 )
-    elif bDescriptorSubtype == CDC.Subtype.ACM:
-        return AbstractControlManagement(
-                 bLength=getVal(field["bLength"], 0, 0xFF),
-                 bDescriptorType=getVal(field["bDescriptorType"], 0, 0xFF),
-                 bDescriptorSubtype=getVal(field["bDescriptorSubtype"],
-                                           0, 0xFF),
-                 bmCapabilities=getVal(field["bmCapabilities"], 0, 0xFF)
-                 )
-    elif bDescriptorSubtype == CDC.Subtype.DLM:
-        return DirectLineManagement(
-                 bLength=getVal(field["bLength"], 0, 0xFF),
-                 bDescriptorType=getVal(field["bDescriptorType"], 0, 0xFF),
-                 bDescriptorSubtype=getVal(field["bDescriptorSubtype"],
-                                           0, 0xFF),
-                 bmCapabilities=getVal(field["bmCapabilities"], 0, 0xFF)
-                 )
-    elif bDescriptorSubtype == CDC.Subtype.UNION:
-        bSlaveInterface_list = [getVal(i, 0, 0xFF)
-                                for i in field["bSlaveInterface"]]
-        return Union(
-                 bDescriptorType=getVal(field["bDescriptorType"], 0, 0xFF),
-                 bDescriptorSubtype=getVal(field["bDescriptorSubtype"],
-                                           0, 0xFF),
-                 bMasterInterface=getVal(field["bMasterInterface"], 0, 0xFF),
-                 bSlaveInterface_list=bSlaveInterface_list
-                 )
+    bDescriptorSubtype = getByte(field["bDescriptorSubtype"])
+    parser = _cdcSubtypeParsers.get(bDescriptorSubtype)
+    if parser is None:
+        _log.warning("Unsupported CDC subclass: 0x%02x", bDescriptorSubtype)
+        return None
+    return parser(field,
+                  getByte(field["bDescriptorType"]),
+                  bDescriptorSubtype)
+
+
+def _parseHeader(field, bDescriptorType, bDescriptorSubtype):
+    return Header(
+             bLength=getByte(field["bLength"]),
+             bDescriptorType=bDescriptorType,
+             bDescriptorSubtype=bDescriptorSubtype,
+             bcdCDC=getWord(field["bcdCDC"])
+             )
+
+
+def _parseCallManagement(field, bDescriptorType, bDescriptorSubtype):
+    return CallManagement(
+             bLength=getByte(field["bLength"]),
+             bDescriptorType=bDescriptorType,
+             bDescriptorSubtype=bDescriptorSubtype,
+             bmCapabilities=getByte(field["bmCapabilities"]),
+             bDataInterface=getByte(field["bDataInterface"])
+             )
+
+
+def _parseAbstractControlManagement(field, bDescriptorType,
+                                    bDescriptorSubtype):
+    return AbstractControlManagement(
+             bLength=getByte(field["bLength"]),
+             bDescriptorType=bDescriptorType,
+             bDescriptorSubtype=bDescriptorSubtype,
+             bmCapabilities=getByte(field["bmCapabilities"])
+             )
+
+
+def _parseDirectLineManagement(field, bDescriptorType, bDescriptorSubtype):
+    return DirectLineManagement(
+             bLength=getByte(field["bLength"]),
+             bDescriptorType=bDescriptorType,
+             bDescriptorSubtype=bDescriptorSubtype,
+             bmCapabilities=getByte(field["bmCapabilities"])
+             )
+
+
+def _parseUnion(field, bDescriptorType, bDescriptorSubtype):
+    slaves = field["bSlaveInterface"]
+    if (isinstance(slaves, (list, tuple))
+            and all(type(i) is int for i in slaves)):
+        # Plain ints are range checked by bytes() itself
+        bSlaveInterface_list = bytes(slaves)
     else:
-        print("Unsupported CDC subclass")
+        # Hex strings present, or not a list at all
+        bSlaveInterface_list = [getByte(i) for i in slaves]
+    return Union(
+             bDescriptorType=bDescriptorType,
+             bDescriptorSubtype=bDescriptorSubtype,
+             bMasterInterface=getByte(field["bMasterInterface"]),
+             bSlaveInterface_list=bSlaveInterface_list
+             )
+
+
+# Parsers of supported CDC functional descriptors, by bDescriptorSubtype.
+# Fields common to all of them are parsed once by parseCDC and passed in.
+_cdcSubtypeParsers = {
+    CDC.Subtype.HEADER: _parseHeader,
+    CDC.Subtype.CM: _parseCallManagement,
+    CDC.Subtype.ACM: _parseAbstractControlManagement,
+    CDC.Subtype.DLM: _parseDirectLineManagement,
+    CDC.Subtype.UNION: _parseUnion,
+}
 
 
 cdcParsers = {Descriptor.Types.CLASS_SPECIFIC_INTERFACE: parseCDC,
@@ -395,8 +460,26 @@ class CDCRequest:
     SET_CONTROL_LINE_STATE = 0x22
 
 
+# Builders of CDC class requests, all addressed to an interface
+_sendEncapsulatedCommand = USBDeviceRequest.builder(
+    Type.HOST_TO_DEVICE | Type.CLASS | Type.INTERFACE,
+    CDCRequest.SEND_ENCAPSULATED_COMMAND)
+_getEncapsulatedResponse = USBDeviceRequest.builder(
+    Type.DEVICE_TO_HOST | Type.CLASS | Type.INTERFACE,
+    CDCRequest.GET_ENCAPSULATED_RESPONSE)
+_setLineCoding = USBDeviceRequest.builder(
+    Type.HOST_TO_DEVICE | Type.CLASS | Type.INTERFACE,
+    CDCRequest.SET_LINE_CODING)
+_getLineCoding = USBDeviceRequest.builder(
+    Type.DEVICE_TO_HOST | Type.CLASS | Type.INTERFACE,
+    CDCRequest.GET_LINE_CODING)
+_setControlLineState = USBDeviceRequest.builder(
+    Type.HOST_TO_DEVICE | Type.CLASS | Type.INTERFACE,
+    CDCRequest.SET_CONTROL_LINE_STATE)
+
+
 def sendEncapsulatedCommand(interface, data_len):
-    """Return a byte list corresponding to a SET_CONTROL_LINE_STATE request.
+    """Return bytes corresponding to a SET_CONTROL_LINE_STATE request.
 
     Args:
         interface (int): Target interface number.
@@ -404,23 +487,17 @@ def sendEncapsulatedCommand(interface, data_len):
 
     .. doctest::
 
-        >>> sendEncapsulatedCommand(
+        >>> list(sendEncapsulatedCommand(
         ... interface=1,
         ... data_len=16
-        ... )
+        ... ))
         [33, 0, 0, 0, 1, 0, 16, 0]
     """
-    return USBDeviceRequest.build(
-            bmRequestType=Type.HOST_TO_DEVICE | Type.CLASS | Type.INTERFACE,
-            bRequest=CDCRequest.SEND_ENCAPSULATED_COMMAND,
-            wValue=0,
-            wIndex=interface,
-            wLength=data_len,
-            )
+    return _sendEncapsulatedCommand(0, interface, data_len)
 
 
 def getEncapsulatedResponse(interface, data_len):
-    """Return a byte list corresponding to a SET_CONTROL_LINE_STATE request.
+    """Return bytes corresponding to a SET_CONTROL_LINE_STATE request.
 
     Args:
         interface (int): Target interface number.
@@ -428,19 +505,13 @@ def getEncapsulatedResponse(interface, data_len):
 
     .. doctest::
 
-        >>> getEncapsulatedResponse(
+        >>> list(getEncapsulatedResponse(
         ... interface=3,
         ... data_len=32
-        ... )
+        ... ))
         [161, 1, 0, 0, 3, 0, 32, 0]
     """
-    return USBDeviceRequest.build(
-            bmRequestType=Type.DEVICE_TO_HOST | Type.CLASS | Type.INTERFACE,
-            bRequest=CDCRequest.GET_ENCAPSULATED_RESPONSE,
-            wValue=0,
-            wIndex=interface,
-            wLength=data_len,
-            )
+    return _getEncapsulatedResponse(0, interface, data_len)
 
 
 class LineCodingStructure:
@@ -453,7 +524,11 @@ class LineCodingStructure:
         bParityType (int): Parity type.
         bDataBits (int): How many data bits are used.
     """
+    __slots__ = ('dwDTERate', 'bCharFormat', 'bParityType', 'bDataBits',
+                 '_packed')
+
     FORMAT = "<LBBB"
+    _STRUCT = struct.Struct(FORMAT)
 
     STOP_BITS_1 = 0
     STOP_BITS_1_5 = 1
@@ -477,13 +552,18 @@ class LineCodingStructure:
         self.bParityType = bParityType
         self.bDataBits = bDataBits
 
+    def __setattr__(self, name, value):
+        # Same caching scheme as Descriptor
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_packed", None)
+
     @classmethod
     def size(cls):
         """
         >>> LineCodingStructure.size()
         7
         """
-        return struct.calcsize(cls.FORMAT)
+        return cls._STRUCT.size
 
     def __bytes__(self):
         """
@@ -495,12 +575,18 @@ class LineCodingStructure:
         ... )
         >>> bytes(l)
         b'\\x00\\xc2\\x01\\x00\\x00\\x01\\x08'
+        >>> l.dwDTERate = 9600
+        >>> bytes(l)
+        b'\\x80%\\x00\\x00\\x00\\x01\\x08'
         """
-        return struct.pack(self.FORMAT,
-                           self.dwDTERate,
-                           self.bCharFormat,
-                           self.bParityType,
-                           self.bDataBits)
+        packed = self._packed
+        if packed is None:
+            packed = self._STRUCT.pack(self.dwDTERate,
+                                       self.bCharFormat,
+                                       self.bParityType,
+                                       self.bDataBits)
+            object.__setattr__(self, "_packed", packed)
+        return packed
 
     def get(self):
         """Return structure contents as a list of bytes.
@@ -519,8 +605,11 @@ class LineCodingStructure:
         return list(bytes(self))
 
 
+_LINE_CODING_SIZE = LineCodingStructure.size()
+
+
 def setLineCoding(interface):
-    """Return a byte list corresponding to a SET_CONTROL_LINE_STATE request.
+    """Return bytes corresponding to a SET_CONTROL_LINE_STATE request.
     See LineCodingStructure for defined parameters.
 
     Args:
@@ -529,20 +618,14 @@ def setLineCoding(interface):
 
     .. doctest::
 
-        >>> setLineCoding(interface=5)
+        >>> list(setLineCoding(interface=5))
         [33, 32, 0, 0, 5, 0, 7, 0]
     """
-    return USBDeviceRequest.build(
-            bmRequestType=Type.HOST_TO_DEVICE | Type.CLASS | Type.INTERFACE,
-            bRequest=CDCRequest.SET_LINE_CODING,
-            wValue=0,
-            wIndex=interface,
-            wLength=LineCodingStructure.size(),
-            )
+    return _setLineCoding(0, interface, _LINE_CODING_SIZE)
 
 
 def getLineCoding(interface):
-    """Return a byte list corresponding to a GET_CONTROL_LINE_STATE request.
+    """Return bytes corresponding to a GET_CONTROL_LINE_STATE request.
     See LineCodingStructure for defined parameters.
 
     Args:
@@ -550,20 +633,14 @@ def getLineCoding(interface):
 
     .. doctest::
 
-        >>> getLineCoding(interface=2)
+        >>> list(getLineCoding(interface=2))
         [161, 33, 0, 0, 2, 0, 7, 0]
     """
-    return USBDeviceRequest.build(
-            bmRequestType=Type.DEVICE_TO_HOST | Type.CLASS | Type.INTERFACE,
-            bRequest=CDCRequest.GET_LINE_CODING,
-            wValue=0,
-            wIndex=interface,
-            wLength=LineCodingStructure.size(),
-            )
+    return _getLineCoding(0, interface, _LINE_CODING_SIZE)
 
 
 def setControlLineState(interface, rts, dtr):
-    """Return a byte list corresponding to a SET_CONTROL_LINE_STATE request.
+    """Return bytes corresponding to a SET_CONTROL_LINE_STATE request.
 
     Args:
         interface (int): Target interface number.
@@ -572,22 +649,17 @@ def setControlLineState(interface, rts, dtr):
 
     .. doctest::
 
-        >>> setControlLineState(0, 1, 1)
+        >>> list(setControlLineState(0, 1, 1))
         [33, 34, 3, 0, 0, 0, 0, 0]
 
-        >>> setControlLineState(3, 1, 0)
+        >>> list(setControlLineState(3, 1, 0))
         [33, 34, 2, 0, 3, 0, 0, 0]
 
-        >>> setControlLineState(5, 0, 1)
+        >>> list(setControlLineState(5, 0, 1))
         [33, 34, 1, 0, 5, 0, 0, 0]
     """
     bitmap = rts << 1 | dtr
-    return USBDeviceRequest.build(
-            bmRequestType=Type.HOST_TO_DEVICE | Type.CLASS | Type.INTERFACE,
-            bRequest=CDCRequest.SET_CONTROL_LINE_STATE,
-            wValue=bitmap,
-            wIndex=interface,
-            wLength=0)
+    return _setControlLineState(bitmap, interface, 0)
 
 
 if __name__ == "__main__":
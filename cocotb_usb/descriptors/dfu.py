@@ -1,6 +1,5 @@
-from struct import pack
 from cocotb_usb.descriptors import Descriptor, USBDeviceRequest
-from cocotb_usb.utils import getVal
+from cocotb_usb.utils import getByte, getWord
 
 DFU_CLASS_CODE = 0xFE       # Application specific class code
 DFU_SUBCLASS_CODE = 0x01    # Device Firmware Update code
@@ -8,7 +7,12 @@ DFU_INTERFACE_PROTOCOL = 0x02
 
 
 class DfuAttributes:
-    """ Class for storing common DFU descriptor attributes."""
+    """ Class for storing common DFU descriptor attributes.
+
+    >>> (DfuAttributes.WILL_DETACH | DfuAttributes.MANIFESTATION_TOLERANT
+    ...  | DfuAttributes.CAN_DNLOAD)
+    13
+    """
 
     # Bit 7..4: reserved
     class WillDetach:
@@ -27,12 +31,33 @@ class DfuAttributes:
         NO = 0 << 0
         YES = 1 << 0
 
+    # Attribute bits, to be combined with ``|`` into bmAttributes
+    WILL_DETACH = WillDetach.YES
+    MANIFESTATION_TOLERANT = ManifestationTolerant.YES
+    CAN_UPLOAD = CanUpload.YES
+    CAN_DNLOAD = CanDnload.YES
+
 
 class DfuFunctionalDescriptor(Descriptor):
-    """Class for storing functional descriptor of DFU."""
+    """Class for storing functional descriptor of DFU.
+
+    >>> d = DfuFunctionalDescriptor(
+    ... bmAttributes=0x0d,
+    ... wDetachTimeout=10000,
+    ... wTransferSize=1024,
+    ... bcdDFUVersion=0x0101)
+    >>> bytes(d)
+    b"\\t!\\r\\x10'\\x00\\x04\\x01\\x01"
+    >>> d.get()
+    [9, 33, 13, 16, 39, 0, 4, 1, 1]
+    """
+    __slots__ = ('bmAttributes', 'wDetachTimeout', 'wTransferSize',
+                 'bcdDFUVersion', 'bLength', 'bDescriptorType')
 
     TYPE = 0x21
     FORMAT = "<3B3H"
+    FIELDS = ('bLength', 'bDescriptorType', 'bmAttributes', 'wDetachTimeout',
+              'wTransferSize', 'bcdDFUVersion')
 
     def __init__(self,
                  bmAttributes,
@@ -49,26 +74,6 @@ class DfuFunctionalDescriptor(Descriptor):
         self.bLength = bLength
         self.bDescriptorType = bDescriptorType
 
-    def __bytes__(self):
-        """
-        >>> d = DfuFunctionalDescriptor(
-        ... bmAttributes=0x0d,
-        ... wDetachTimeout=10000,
-        ... wTransferSize=1024,
-        ... bcdDFUVersion=0x0101)
-        >>> bytes(d)
-        b"\\t!\\r\\x10'\\x00\\x04\\x01\\x01"
-        >>> d.get()
-        [9, 33, 13, 16, 39, 0, 4, 1, 1]
-        """
-        return pack(self.FORMAT,
-                    self.bLength,
-                    self.bDescriptorType,
-                    self.bmAttributes,
-                    self.wDetachTimeout,
-                    self.wTransferSize,
-                    self.bcdDFUVersion)
-
 
 class DfuRequest(USBDeviceRequest):
     """Base class for DFU requests."""
@@ -105,12 +110,12 @@ def parseDfuFunctional(f):
         [9, 33, 13, 16, 39, 0, 4, 1, 1]
     """
     return DfuFunctionalDescriptor(
-        bLength=getVal(f["bLength"], 0, 0xFF),
-        bDescriptorType=getVal(f["bDescriptorType"], 0, 0xFF),
-        bmAttributes=getVal(f["bmAttributes"], 0, 0xFF),
-        wDetachTimeout=getVal(f["wDetachTimeout"], 0, 0xFFFF),
-        wTransferSize=getVal(f["wTransferSize"], 0, 0xFFFF),
-        bcdDFUVersion=getVal(f["bcdDFUVersion"], 0, 0xFFFF)
+        bLength=getByte(f["bLength"]),
+        bDescriptorType=getByte(f["bDescriptorType"]),
+        bmAttributes=getByte(f["bmAttributes"]),
+        wDetachTimeout=getWord(f["wDetachTimeout"]),
+        wTransferSize=getWord(f["wTransferSize"]),
+        bcdDFUVersion=getWord(f["bcdDFUVersion"])
         )
 
 
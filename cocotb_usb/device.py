@@ -6,7 +6,7 @@ from cocotb_usb.descriptors import (Descriptor, EndpointDescriptor,
                                     DeviceQualifierDescriptor)
 from cocotb_usb.descriptors.dfu import DFU_CLASS_CODE, dfuParsers
 from cocotb_usb.descriptors.cdc import CDC, cdcParsers
-from cocotb_usb.utils import getVal
+from cocotb_usb.utils import getByte, getVal, getWord
 
 
 def isStandard(descriptorType):
@@ -58,21 +58,20 @@ def parseDevice(field):
     [18, 1, 1, 2, 239, 2, 1, 64, 9, 18, 240, 91, 1, 1, 1, 2, 0, 1]
     """
     return DeviceDescriptor(
-        bLength=getVal(field["bLength"], 0, 0xFF),
+        bLength=getByte(field["bLength"]),
         bDescriptorType=getVal(field["bDescriptorType"], 1, 1),
-        bcdUSB=getVal(field["bcdUSB"], 0, 0xFFFF),
-        bDeviceClass=getVal(field["bDeviceClass"], 0, 0xFF),
-        bDeviceSubClass=getVal(field["bDeviceSubClass"], 0, 0xFF),
-        bDeviceProtocol=getVal(field["bDeviceProtocol"], 0, 0xFF),
-        bMaxPacketSize0=getVal(field["bMaxPacketSize0"], 0, 0xFF),
-        idVendor=getVal(field["idVendor"], 0, 0xFFFF),
-        idProduct=getVal(field["idProduct"], 0, 0xFFFF),
-        bcdDevice=getVal(field["bcdDevice"], 0, 0xFFFF),
-        iManufacturer=getVal(field["iManufacturer"], 0, 0xFF),
-        iProduct=getVal(field["iProduct"], 0, 0xFF),
-        iSerialNumber=getVal(field["iSerial"], 0, 0xFF),
-        bNumConfigurations=getVal(field["bNumConfigurations"], 0,
-                                  0xFF))
+        bcdUSB=getWord(field["bcdUSB"]),
+        bDeviceClass=getByte(field["bDeviceClass"]),
+        bDeviceSubClass=getByte(field["bDeviceSubClass"]),
+        bDeviceProtocol=getByte(field["bDeviceProtocol"]),
+        bMaxPacketSize0=getByte(field["bMaxPacketSize0"]),
+        idVendor=getWord(field["idVendor"]),
+        idProduct=getWord(field["idProduct"]),
+        bcdDevice=getWord(field["bcdDevice"]),
+        iManufacturer=getByte(field["iManufacturer"]),
+        iProduct=getByte(field["iProduct"]),
+        iSerialNumber=getByte(field["iSerial"]),
+        bNumConfigurations=getByte(field["bNumConfigurations"]))
 
 
 def parseConfiguration(field):
@@ -94,25 +93,21 @@ def parseConfiguration(field):
     """
     interface_list = [parse(i) for i in field["Interface"]]
     return ConfigDescriptor(
-        bLength=getVal(field["bLength"], 0, 0xFF),
+        bLength=getByte(field["bLength"]),
         bDescriptorType=getVal(
             field["bDescriptorType"], 2, 2),
-        wTotalLength=getVal(
-            field["wTotalLength"], 0, 0xFFFF),
-        bNumInterfaces=getVal(
-            field["bNumInterfaces"], 0, 0xFF),
-        bConfigurationValue=getVal(
-            field["bConfigurationValue"], 0, 0xFF),
-        iConfiguration=getVal(
-            field["iConfiguration"], 0, 0xFF),
-        bmAttributes=getVal(
-            field["bmAttributes"], 0, 0xFF),
-        bMaxPower=getVal(field["bMaxPower"], 0, 0xFF),
+        wTotalLength=getWord(field["wTotalLength"]),
+        bNumInterfaces=getByte(field["bNumInterfaces"]),
+        bConfigurationValue=getByte(field["bConfigurationValue"]),
+        iConfiguration=getByte(field["iConfiguration"]),
+        bmAttributes=getByte(field["bmAttributes"]),
+        bMaxPower=getByte(field["bMaxPower"]),
         interfaces=interface_list)
 
 
 class StringDescriptorDict(dict):
     '''Helper class to assign string descriptors to correct UsbDevice field'''
+    __slots__ = ()
 
 
 def parseStrings(field):
@@ -133,15 +128,46 @@ def parseStrings(field):
     """ # noqa
     descriptors = StringDescriptorDict()
     # At key 0 we expect an array of LangId codes
-    langIdArray = [int(i, base=16) for i in field["0"]]
+    langIds = field["0"]
+    langIdArray = [int(i, base=16) for i in langIds]
     descriptors[0] = StringDescriptorZero(langIdArray)
-    for lid in field["0"]:
-        descriptors[int(lid, base=16)] = {int(i, base=16):
-                                          StringDescriptor(field[lid][i])
-                                          for i in field[lid]}
+    for lid, langId in zip(langIds, langIdArray):
+        descriptors[langId] = {int(i, base=16): StringDescriptor(s)
+                               for i, s in field[lid].items()}
     return descriptors
 
 
+# Values of endpoint fields given by name in JSON config files
+_endpointDirections = {
+    "IN": EndpointDescriptor.Direction.IN,
+    "OUT": EndpointDescriptor.Direction.OUT,
+}
+_transferTypes = {
+    "Control": EndpointDescriptor.TransferType.CONTROL,
+    "Isochronous": EndpointDescriptor.TransferType.ISOCHRONOUS,
+    "Bulk": EndpointDescriptor.TransferType.BULK,
+    "Interrupt": EndpointDescriptor.TransferType.INTERRUPT,
+}
+_synchronizationTypes = {
+    "None": EndpointDescriptor.SynchronizationType.NO,
+    "Asynchronous": EndpointDescriptor.SynchronizationType.ASYNC,
+    "Adaptive": EndpointDescriptor.SynchronizationType.ADAPTIVE,
+    "Synchronous": EndpointDescriptor.SynchronizationType.SYNC,
+}
+_usageTypes = {
+    "Data": EndpointDescriptor.UsageType.DATA,
+    "Feedback": EndpointDescriptor.UsageType.FEEDBACK,
+    "Implicit feedback Data": EndpointDescriptor.UsageType.IFDATA,
+}
+# bmAttributes for every (Transfer, Synch, Usage) combination
+_endpointAttributes = {
+    (transfer, synch, usage): eUsage << 5 | eSynch << 3 | eTransfer
+    for transfer, eTransfer in _transferTypes.items()
+    for synch, eSynch in _synchronizationTypes.items()
+    for usage, eUsage in _usageTypes.items()
+}
+
+
 def parseEndpoint(e):
     """
     >>> f = {
@@ -174,66 +200,39 @@ def parseEndpoint(e):
     >>> e.get()
     [7, 5, 129, 130, 64, 0, 1]
     """
-    bLength = getVal(e["bLength"], 0, 0xFF)
+    bLength = getByte(e["bLength"])
 
-    if isinstance(e["bEndpointAddress"], str):
-        bEndpointAddress = getVal(e["bEndpointAddress"], 0, 0xFF)
+    address = e["bEndpointAddress"]
+    if isinstance(address, str):
+        bEndpointAddress = getByte(address)
     else:
-        if e["bEndpointAddress"][1] == "IN":
-            endpointDir = EndpointDescriptor.Direction.IN
-        elif e["bEndpointAddress"][1] == "OUT":
-            endpointDir = EndpointDescriptor.Direction.OUT
-
-        bEndpointAddress = getVal(e["bEndpointAddress"][0], 0,
-                                  15) | (endpointDir << 7)
+        endpointDir = _endpointDirections[address[1]]
+        bEndpointAddress = getVal(address[0], 0, 15) | (endpointDir << 7)
 
-    if isinstance(e["bmAttributes"], str):
-        bmAttributes = getVal(e["bmAttributes"], 0, 0xFF)
+    attributes = e["bmAttributes"]
+    if isinstance(attributes, str):
+        bmAttributes = getByte(attributes)
     else:
-        if e["bmAttributes"]["Transfer"] == "Control":
-            eTransfer = EndpointDescriptor.TransferType.CONTROL
-        elif e["bmAttributes"]["Transfer"] == "Isochronous":
-            eTransfer = EndpointDescriptor.TransferType.ISOCHRONOUS
-        elif e["bmAttributes"]["Transfer"] == "Bulk":
-            eTransfer = EndpointDescriptor.TransferType.BULK
-        elif e["bmAttributes"]["Transfer"] == "Interrupt":
-            eTransfer = EndpointDescriptor.TransferType.INTERRUPT
-
-        if e["bmAttributes"]["Synch"] == "None":
-            eSynch = EndpointDescriptor.SynchronizationType.NO
-        elif e["bmAttributes"]["Synch"] == "Asynchronous":
-            eSynch = EndpointDescriptor.SynchronizationType.ASYNC
-        elif e["bmAttributes"]["Synch"] == "Adaptive":
-            eSynch = EndpointDescriptor.SynchronizationType.ADAPTIVE
-        elif e["bmAttributes"]["Synch"] == "Synchronous":
-            eSynch = EndpointDescriptor.SynchronizationType.SYNC
-
-        if e["bmAttributes"]["Usage"] == "Data":
-            eUsage = EndpointDescriptor.UsageType.DATA
-        elif e["bmAttributes"]["Usage"] == "Feedback":
-            eUsage = EndpointDescriptor.UsageType.FEEDBACK
-        elif e["bmAttributes"]["Usage"] == "Implicit feedback Data":
-            eUsage = EndpointDescriptor.UsageType.IFDATA
-
-        bmAttributes = eUsage << 5 | eSynch << 3 | eTransfer
+        bmAttributes = _endpointAttributes[attributes["Transfer"],
+                                           attributes["Synch"],
+                                           attributes["Usage"]]
 
     # Bits 15..13 must be set to zero below
     wMaxPacketSize = getVal(e["wMaxPacketSize"], 0, 0x1FFF)
-    bInterval = getVal(e["bInterval"], 0, 0xFF)
+    bInterval = getByte(e["bInterval"])
 
     return EndpointDescriptor(bLength, bEndpointAddress, bmAttributes,
                               wMaxPacketSize, bInterval)
 
 
+_classParsers = {
+    DFU_CLASS_CODE: dfuParsers,
+    CDC.Type.COMM: cdcParsers,
+}
+
+
 def getClassParsers(c):
-    parsers = {
-            DFU_CLASS_CODE: dfuParsers,
-            CDC.Type.COMM: cdcParsers
-            }
-    try:
-        return parsers[c]
-    except KeyError:
-        return None
+    return _classParsers.get(c)
 
 
 def parseInterface(intf):
@@ -253,20 +252,20 @@ def parseInterface(intf):
     >>> i.get()
     [9, 4, 0, 0, 5, 5, 1, 2, 0]
     """
-    bInterfaceClass = getVal(intf["bInterfaceClass"], 0, 0xFF)
-    bInterfaceSubclass = getVal(intf["bInterfaceSubClass"], 0, 0xFF)
-    bInterfaceProtocol = getVal(intf["bInterfaceProtocol"], 0, 0xFF)
+    bInterfaceClass = getByte(intf["bInterfaceClass"])
+    bInterfaceSubclass = getByte(intf["bInterfaceSubClass"])
+    bInterfaceProtocol = getByte(intf["bInterfaceProtocol"])
     parsers = getClassParsers(bInterfaceClass)
     sub_list = [parse(e, parsers) for e in intf["Subdescriptors"]]
     return InterfaceDescriptor(
-        bLength=getVal(intf["bLength"], 0, 0xFF),
-        bInterfaceNumber=getVal(intf["bInterfaceNumber"], 0, 0xFF),
-        bAlternateSetting=getVal(intf["bAlternateSetting"], 0, 0xFF),
-        bNumEndpoints=getVal(intf["bNumEndpoints"], 0, 0xFF),
+        bLength=getByte(intf["bLength"]),
+        bInterfaceNumber=getByte(intf["bInterfaceNumber"]),
+        bAlternateSetting=getByte(intf["bAlternateSetting"]),
+        bNumEndpoints=getByte(intf["bNumEndpoints"]),
         bInterfaceClass=bInterfaceClass,
         bInterfaceSubclass=bInterfaceSubclass,
         bInterfaceProtocol=bInterfaceProtocol,
-        iInterface=getVal(intf["iInterface"], 0, 0xFF),
+        iInterface=getByte(intf["iInterface"]),
         subdescriptors=sub_list)
 
 
@@ -288,14 +287,14 @@ def parseDeviceQualifier(field):
     [18, 1, 0, 1, 255, 0, 255, 64, 1, 0]
     """
     return DeviceQualifierDescriptor(
-        bLength=getVal(field["bLength"], 0, 0xFF),
-        bDescriptorType=getVal(field["bDescriptorType"], 0, 0xFF),
-        bcdUSB=getVal(field["bcdUSB"], 0, 0xFFFF),
-        bDeviceClass=getVal(field["bDeviceClass"], 0, 0xFF),
-        bDeviceSubClass=getVal(field["bDeviceSubClass"], 0, 0xFF),
-        bDeviceProtocol=getVal(field["bDeviceProtocol"], 0, 0xFF),
-        bMaxPacketSize0=getVal(field["bMaxPacketSize0"], 0, 0xFF),
-        bNumConfigurations=getVal(field["bNumConfigurations"], 0, 0xFF)
+        bLength=getByte(field["bLength"]),
+        bDescriptorType=getByte(field["bDescriptorType"]),
+        bcdUSB=getWord(field["bcdUSB"]),
+        bDeviceClass=getByte(field["bDeviceClass"]),
+        bDeviceSubClass=getByte(field["bDeviceSubClass"]),
+        bDeviceProtocol=getByte(field["bDeviceProtocol"]),
+        bMaxPacketSize0=getByte(field["bMaxPacketSize0"]),
+        bNumConfigurations=getByte(field["bNumConfigurations"])
     )
 
 
@@ -374,7 +373,7 @@ def parse(field, customParsers=None):
     >>> c.get()
     [9, 2, 53, 0, 1, 1, 0, 64, 0, 9, 4, 0, 0, 5, 5, 1, 55, 0, 7, 5, 129, 1, 0, 1, 1, 7, 5, 2, 1, 0, 1, 1]
     """ # noqa
-    bDescriptorType = getVal(field["bDescriptorType"], 0, 0xFF)
+    bDescriptorType = getByte(field["bDescriptorType"])
     if isStandard(bDescriptorType):
         return standardParsers[bDescriptorType](field)
     elif customParsers is not None:
@@ -0,0 +1,37 @@
+// Clock generator with jitter, equivalent to cocotb_usb.clocks.UnstableClock
+//
+// Every half period the next clock level is scheduled with a delay of
+// HALF_PERIOD_PS plus a random offset in the range
+// [-DELTA_NEG_PS, DELTA_POS_PS], so jitter does not accumulate over time.
+// DELTA_NEG_PS must not exceed HALF_PERIOD_PS.
+//
+// Requires a simulator supporting $urandom_range. For other simulators
+// use the Python implementation (leave USE_HDL_CLKGEN unset).
+
+`timescale 1ps/1ps
+
+module unstable_clock #(
+    parameter HALF_PERIOD_PS = 10415,
+    parameter DELTA_NEG_PS = 0,
+    parameter DELTA_POS_PS = 0,
+    parameter START_HIGH = 1
+) (
+    output reg clk
+);
+
+    reg level;
+
+    // A single process sets the start level before toggling, a separate
+    // initial block would race with it at time 0
+    initial begin
+        level = START_HIGH;
+        clk = START_HIGH;
+        forever begin
+            level = ~level;
+            clk <= #(HALF_PERIOD_PS - DELTA_NEG_PS
+                     + $urandom_range(DELTA_NEG_PS + DELTA_POS_PS, 0)) level;
+            #(HALF_PERIOD_PS);
+        end
+    end
+
+endmodule
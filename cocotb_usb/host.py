@@ -380,7 +380,7 @@ class UsbTest:
 
         Args:
             addr (int): Device address.
-            setup_data: Request to be sent, as list of bytes.
+            setup_data: Request to be sent, as bytes.
             descriptor_data (optional): Data to be sent, as list of bytes.
         """
         epaddr_out = EndpointType.epaddr(0, EndpointType.OUT)
@@ -437,7 +437,7 @@ class UsbTest:
 
         Args:
             addr (int): Device address.
-            setup_data: Request to be sent, as list of bytes.
+            setup_data: Request to be sent, as bytes.
             descriptor_data (optional): Data expected to be received, as list
                 of bytes.
         """
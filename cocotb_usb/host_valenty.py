@@ -109,6 +109,8 @@ class UsbTestValenty(UsbTest):
 
     @cocotb.coroutine
     def expect_setup(self, epaddr, expected_data):
+        # Requests are built as bytes, data read back from CSRs is a list
+        expected_data = list(expected_data)
         actual_data = []
         # wait for data to appear
         for i in range(300 * self.clk_factor):
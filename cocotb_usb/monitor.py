@@ -17,6 +17,9 @@ class UsbMonitor(BusMonitor):
     # Internal states
     (IDLE, PRIMED, RECEIVING) = range(3)
 
+    # Line states by (D+, D-) values
+    LINE_STATES = {(0, 0): '_', (1, 1): '1', (1, 0): 'J', (0, 1): 'K'}
+
     def __init__(self, *args, **kwargs):
         self.cycles = kwargs.pop('oversampling', 4)
         self.clock_period = kwargs.pop('clk_period', 20830)  # 48 MHz
@@ -37,18 +40,16 @@ class UsbMonitor(BusMonitor):
         EOP = nrzi(eop(), cycles=self.cycles)
         bit_time = 0
 
+        # Resolve handles once, and read each line once per sample
+        usb_d_p = self.dut.usb_d_p
+        usb_d_n = self.dut.usb_d_n
+        line_states = self.LINE_STATES
+
         def current():
-            values = (self.dut.usb_d_p, self.dut.usb_d_n)
-
-            if values == (0, 0):
-                return '_'
-            elif values == (1, 1):
-                return '1'
-            elif values == (1, 0):
-                return 'J'
-            elif values == (0, 1):
-                return 'K'
-            else:
+            values = (int(usb_d_p), int(usb_d_n))
+            try:
+                return line_states[values]
+            except KeyError:
                 raise TestFailure("Unrecognized dut values: {}".format(values))
 
         # We want to sample in the middle of a signal to allow for jitter
@@ -45,3 +45,17 @@ def getVal(val, minimum, maximum):
     if not minimum <= val <= maximum:
         raise ValueError()
     return val
+
+
+def getByte(val):
+    '''Same as getVal(val, 0, 0xFF), with a fast path for plain ints'''
+    if type(val) is int and 0 <= val <= 0xFF:
+        return val
+    return getVal(val, 0, 0xFF)
+
+
+def getWord(val):
+    '''Same as getVal(val, 0, 0xFFFF), with a fast path for plain ints'''
+    if type(val) is int and 0 <= val <= 0xFFFF:
+        return val
+    return getVal(val, 0, 0xFFFF)
@@ -13,6 +13,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/antmicro/usb-test-suite-cocotb-usb",
     packages=setuptools.find_packages(),
+    package_data={"cocotb_usb": ["hdl/*.v"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: BSD License",